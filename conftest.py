@@ -0,0 +1,25 @@
+import os
+import json
+import tempfile
+
+
+# The Enka constants are loaded when the package is imported. Run the tests
+# from a temporary folder holding minimal cached constants, so that no
+# network access is needed.
+_TEST_ROOT: str = tempfile.mkdtemp()
+_CONSTANTS_FOLDER: str = os.path.join(_TEST_ROOT, "cache", "constants")
+os.makedirs(_CONSTANTS_FOLDER)
+_CONSTANTS: dict[str, object] = {
+    "characters.json": {"10000002": {"NameTextMapHash": 3568183345}},
+    "loc.json": {"en": {"3568183345": "Kamisato Ayaka"}},
+    "ReliquaryAffixExcelConfigData.json": [
+        {"id": 501021, "propType": "FIGHT_PROP_HP", "propValue": 209.13},
+        {"id": 501204, "propType": "FIGHT_PROP_CRITICAL", "propValue": 0.0389},
+        {"id": 501234, "propType": "FIGHT_PROP_CRITICAL_HURT", "propValue": 0.0777},
+        {"id": 509999, "propType": "FIGHT_PROP_SOME_NEW_PROP", "propValue": 1.0},
+    ],
+}
+for file_name, content in _CONSTANTS.items():
+    with open(os.path.join(_CONSTANTS_FOLDER, file_name), "w") as f:
+        json.dump(content, f)
+os.chdir(_TEST_ROOT)
@@ -2,10 +2,12 @@ import os
 from typing import Any
 import json
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 # Custom modules
-from ..constants.general import CONSTANTS_CACHE_FOLDER, CONSTANTS_CACHE_EXPIRATION
+from ..constants.general import LANG, CONSTANTS_CACHE_FOLDER, CONSTANTS_CACHE_EXPIRATION
+from ..types import StatModifier, PROP_ID_TO_STAT_MODIFIER
 from ..utils.general import smart_json_load
 
 
@@ -13,22 +15,70 @@ from ..utils.general import smart_json_load
 BASE_URL: str = "https://enka.network/api/uid"
 
 
+def _load_constants() -> tuple[
+    dict[Any, Any],
+    dict[int, str],
+    dict[int, tuple[StatModifier, float]],
+]:
+    """
+    Load the characters, the localized texts and the artifact rolls. They
+    are loaded concurrently, as each of them may require a request when not
+    cached. Only the texts of the active language are kept, indexed by
+    their integer hash, and the artifact rolls are indexed by their ID,
+    keeping only their type and value.
+    """
+    # Load the files concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        characters_future: Future[Any] = executor.submit(
+            smart_json_load,
+            url="https://raw.githubusercontent.com/EnkaNetwork/API-docs/refs/heads/master/store/characters.json",
+            folder=CONSTANTS_CACHE_FOLDER,
+            expiration=CONSTANTS_CACHE_EXPIRATION,
+        )
+        loc_future: Future[Any] = executor.submit(
+            smart_json_load,
+            url="https://raw.githubusercontent.com/EnkaNetwork/API-docs/refs/heads/master/store/loc.json",
+            folder=CONSTANTS_CACHE_FOLDER,
+            expiration=CONSTANTS_CACHE_EXPIRATION,
+        )
+        reliquaryaffix_future: Future[Any] = executor.submit(
+            smart_json_load,
+            url="https://gitlab.com/Dimbreath/AnimeGameData/-/raw/master/ExcelBinOutput/ReliquaryAffixExcelConfigData.json",
+            folder=CONSTANTS_CACHE_FOLDER,
+            expiration=CONSTANTS_CACHE_EXPIRATION,
+        )
+
+    # Index the texts of the active language by integer keys, so that
+    # lookups do not need to convert hashes to strings
+    loc_by_hash: dict[int, str] = {
+        int(key): value for key, value in loc_future.result()[LANG].items() if key.isdigit()
+    }
+
+    # Index the artifact rolls by their ID, so that each roll can be resolved
+    # with a single lookup. Rolls of unknown or invalid types are left out,
+    # so that new upstream data does not break the import.
+    reliquaryaffix_by_id: dict[int, tuple[StatModifier, float]] = {
+        element["id"]: (PROP_ID_TO_STAT_MODIFIER[element["propType"]], element["propValue"])
+        for element in reliquaryaffix_future.result()
+        if element["propType"] in PROP_ID_TO_STAT_MODIFIER
+    }
+
+    # Return the loaded constants
+    return characters_future.result(), loc_by_hash, reliquaryaffix_by_id
+
+
 # Load some other constants
-CHARACTERS: dict[Any, Any] = smart_json_load(
-    url="https://raw.githubusercontent.com/EnkaNetwork/API-docs/refs/heads/master/store/characters.json",
-    folder=CONSTANTS_CACHE_FOLDER,
-    expiration=CONSTANTS_CACHE_EXPIRATION,
-)
-LOC: dict[Any, Any] = smart_json_load(
-    url="https://raw.githubusercontent.com/EnkaNetwork/API-docs/refs/heads/master/store/loc.json",
-    folder=CONSTANTS_CACHE_FOLDER,
-    expiration=CONSTANTS_CACHE_EXPIRATION,
-)
-RELIQUARIAFFIXEXCELCONFIGDATA: list[dict[str, Any]] = smart_json_load(
-    url="https://gitlab.com/Dimbreath/AnimeGameData/-/raw/master/ExcelBinOutput/ReliquaryAffixExcelConfigData.json",
-    folder=CONSTANTS_CACHE_FOLDER,
-    expiration=CONSTANTS_CACHE_EXPIRATION,
-)
+CHARACTERS: dict[Any, Any]
+LOC_BY_HASH: dict[int, str]
+RELIQUARYAFFIX_BY_ID: dict[int, tuple[StatModifier, float]]
+CHARACTERS, LOC_BY_HASH, RELIQUARYAFFIX_BY_ID = _load_constants()
+
+# Index characters by integer keys, so that lookups do not need to convert
+# IDs to strings. Keys that are not plain integers (such as the per-element
+# Traveler entries) are left out.
+CHARACTERS_BY_ID: dict[int, dict[Any, Any]] = {
+    int(key): value for key, value in CHARACTERS.items() if key.isdigit()
+}
 
 
 # Enka.Network API response codes
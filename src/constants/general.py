@@ -14,3 +14,4 @@ CONSTANTS_CACHE_EXPIRATION: dt.timedelta = dt.timedelta(days=1)
 # Player cache settings
 PLAYERS_CACHE_FOLDER: str = os.path.join("cache", "players")
 PLAYER_CACHE_EXPIRATION: dt.timedelta = dt.timedelta(hours=1)
+PLAYER_MEMORY_CACHE_MAXSIZE: int = 512
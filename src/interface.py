@@ -14,10 +14,10 @@ class Equipment:
     def __init__(self, equipment_dict: WeaponDict | ArtifactDict) -> None:
 
         # Set rarity
-        self.rarity: int = nested_get(equipment_dict, "flat", "rankLevel")
+        self.rarity: int = equipment_dict["flat"]["rankLevel"]
 
         # Set icon
-        self.icon: str = nested_get(equipment_dict, "flat", "icon")
+        self.icon: str = equipment_dict["flat"]["icon"]
 
 
 class Weapon(Equipment):
@@ -27,10 +27,10 @@ class Weapon(Equipment):
         super().__init__(weapon_dict)
 
         # Set level
-        self.level: int = nested_get(weapon_dict, "weapon", "level")
+        self.level: int = weapon_dict["weapon"]["level"]
 
         # Set rank
-        self.rank: int = nested_get(weapon_dict, "weapon", "promoteLevel")
+        self.rank: int = weapon_dict["weapon"].get("promoteLevel", 0)
 
         # Prompt the creation
         logging.debug(f"Weapon created")
@@ -76,15 +76,18 @@ class Character:
         # Set constellation
         self.constellation: int = 0  # TODO
 
+        # Get the equipment
+        weapon_dict: WeaponDict
+        artifact_dicts: dict[ArtifactType, ArtifactDict]
+        weapon_dict, artifact_dicts = partition_equipment(character_dict)
+
         # Set weapon
-        self.weapon: Weapon = Weapon(get_character_weapon(character_dict))
+        self.weapon: Weapon = Weapon(weapon_dict)
 
         # Set artifacts
         self.artifacts: dict[ArtifactType, Artifact | None] = {t: None for t in ArtifactType}
-        for t in ArtifactType:
-            artifact_dict: ArtifactDict | None = get_character_artifact(character_dict, t)
-            if artifact_dict is not None:
-                self.artifacts[t] = Artifact(artifact_dict)
+        for t, artifact_dict in artifact_dicts.items():
+            self.artifacts[t] = Artifact(artifact_dict)
 
         # Prompt the creation
         logging.debug(f"Character {self.name} created")
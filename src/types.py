@@ -41,6 +41,18 @@ class StatModifier(Enum):
     DMG_Geo = "Geo DMG bonus"
     DMG_Dendro = "Dendro DMG bonus"
 
+    @classmethod
+    def from_prop_id(cls, prop_id: str) -> "StatModifier":
+        """
+        Get the stat modifier corresponding to a property ID.
+        """
+        if prop_id in INVALID_PROP_IDS:
+            raise ValueError(f"Main stat {prop_id} is not valid for an artifact.")
+        try:
+            return PROP_ID_TO_STAT_MODIFIER[prop_id]
+        except KeyError:
+            raise ValueError(f"Invalid property ID {prop_id}.") from None
+
 
 class ArtifactType(Enum):
     FLOWER = "Flower of Life"
@@ -49,11 +61,74 @@ class ArtifactType(Enum):
     GOBLET = "Goblet of Eonothem"
     CIRCLET = "Circlet of Logos"
 
+    @classmethod
+    def from_equip_type(cls, equip_type: str) -> "ArtifactType":
+        """
+        Get the artifact type corresponding to an equip type.
+        """
+        try:
+            return EQUIP_TYPE_TO_ARTIFACT_TYPE[equip_type]
+        except KeyError:
+            raise ValueError(f"Invalid equip type {equip_type}.") from None
+
+
+# Mapping between property IDs and stat modifiers
+PROP_ID_TO_STAT_MODIFIER: dict[str, StatModifier] = {
+    "FIGHT_PROP_HP": StatModifier.HP_FLAT,
+    "FIGHT_PROP_HP_PERCENT": StatModifier.HP_PERCENT,
+    "FIGHT_PROP_ATTACK": StatModifier.ATK_FLAT,
+    "FIGHT_PROP_ATTACK_PERCENT": StatModifier.ATK_PERCENT,
+    "FIGHT_PROP_DEFENSE": StatModifier.DEF_FLAT,
+    "FIGHT_PROP_DEFENSE_PERCENT": StatModifier.DEF_PERCENT,
+    "FIGHT_PROP_CRITICAL": StatModifier.CR,
+    "FIGHT_PROP_CRITICAL_HURT": StatModifier.CD,
+    "FIGHT_PROP_CHARGE_EFFICIENCY": StatModifier.ER,
+    "FIGHT_PROP_ELEMENT_MASTERY": StatModifier.EM,
+    "FIGHT_PROP_HEAL_ADD": StatModifier.HealingBonus,
+    "FIGHT_PROP_PHYSICAL_ADD_HURT": StatModifier.DMG_Physical,
+    "FIGHT_PROP_FIRE_ADD_HURT": StatModifier.DMG_Fire,
+    "FIGHT_PROP_ELEC_ADD_HURT": StatModifier.DMG_Electro,
+    "FIGHT_PROP_WATER_ADD_HURT": StatModifier.DMG_Hydro,
+    "FIGHT_PROP_WIND_ADD_HURT": StatModifier.DMG_Anemo,
+    "FIGHT_PROP_ICE_ADD_HURT": StatModifier.DMG_Cryo,
+    "FIGHT_PROP_ROCK_ADD_HURT": StatModifier.DMG_Geo,
+    "FIGHT_PROP_GRASS_ADD_HURT": StatModifier.DMG_Dendro,
+}
+
+# Property IDs that exist but can never be an artifact stat
+INVALID_PROP_IDS: frozenset[str] = frozenset({
+    "FIGHT_PROP_BASE_ATTACK",
+})
+
+# Every stat modifier must be reachable from a property ID
+if set(PROP_ID_TO_STAT_MODIFIER.values()) != set(StatModifier):
+    raise ValueError(
+        "Stat modifiers without a property ID: "
+        f"{set(StatModifier) - set(PROP_ID_TO_STAT_MODIFIER.values())}."
+    )
 
-PERCENT_STAT_MODIFIERS: set[StatModifier] = {
+
+# Mapping between equip types and artifact types
+EQUIP_TYPE_TO_ARTIFACT_TYPE: dict[str, ArtifactType] = {
+    "EQUIP_BRACER": ArtifactType.FLOWER,
+    "EQUIP_NECKLACE": ArtifactType.PLUME,
+    "EQUIP_SHOES": ArtifactType.SANDS,
+    "EQUIP_RING": ArtifactType.GOBLET,
+    "EQUIP_DRESS": ArtifactType.CIRCLET,
+}
+
+# Every artifact type must be reachable from an equip type
+if set(EQUIP_TYPE_TO_ARTIFACT_TYPE.values()) != set(ArtifactType):
+    raise ValueError(
+        "Artifact types without an equip type: "
+        f"{set(ArtifactType) - set(EQUIP_TYPE_TO_ARTIFACT_TYPE.values())}."
+    )
+
+
+PERCENT_STAT_MODIFIERS: frozenset[StatModifier] = frozenset({
     StatModifier.HP_PERCENT,
     StatModifier.ATK_PERCENT,
     StatModifier.DEF_PERCENT,
     StatModifier.CR,
     StatModifier.CD,
-}
+})
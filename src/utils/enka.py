@@ -1,65 +1,52 @@
 import os
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import datetime as dt
 import logging
+import functools
+import threading
 
 
 # Custom modules
 from ..types import *
-from ..utils.general import nested_get
-from ..constants.general import LANG, PLAYERS_CACHE_FOLDER, PLAYER_CACHE_EXPIRATION
-from ..constants.enka import BASE_URL, CHARACTERS, LOC, RELIQUARIAFFIXEXCELCONFIGDATA, RESPONSE_CODES
+from ..utils.general import nested_get, atomic_write
+from ..constants.general import PLAYERS_CACHE_FOLDER, PLAYER_CACHE_EXPIRATION, PLAYER_MEMORY_CACHE_MAXSIZE
+from ..constants.enka import BASE_URL, CHARACTERS_BY_ID, LOC_BY_HASH, RELIQUARYAFFIX_BY_ID, RESPONSE_CODES
 
 
+# Session shared by all requests to the Enka.Network API, so that
+# connections are kept alive between calls
+_SESSION: requests.Session = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
 
 def prop_id_to_artifact_stat(prop_id: str) -> StatModifier:
     """
     Convert a property ID to an artifact stat.
     """
-    match prop_id:
-        case "FIGHT_PROP_BASE_ATTACK":
-            raise ValueError(f"Main stat {prop_id} is not valid for an artifact.")
-        case "FIGHT_PROP_HP":
-            return StatModifier.HP_FLAT
-        case "FIGHT_PROP_HP_PERCENT":
-            return StatModifier.HP_PERCENT
-        case "FIGHT_PROP_ATTACK":
-            return StatModifier.ATK_FLAT
-        case "FIGHT_PROP_ATTACK_PERCENT":
-            return StatModifier.ATK_PERCENT
-        case "FIGHT_PROP_DEFENSE":
-            return StatModifier.DEF_FLAT
-        case "FIGHT_PROP_DEFENSE_PERCENT":
-            return StatModifier.DEF_PERCENT
-        case "FIGHT_PROP_CRITICAL":
-            return StatModifier.CR
-        case "FIGHT_PROP_CRITICAL_HURT":
-            return StatModifier.CD
-        case "FIGHT_PROP_CHARGE_EFFICIENCY":
-            return StatModifier.ER
-        case "FIGHT_PROP_ELEMENT_MASTERY":
-            return StatModifier.EM
-        case "FIGHT_PROP_HEAL_ADD":
-            return StatModifier.HealingBonus
-        case "FIGHT_PROP_PHYSICAL_ADD_HURT":
-            return StatModifier.DMG_Physical
-        case "FIGHT_PROP_FIRE_ADD_HURT":
-            return StatModifier.DMG_Fire
-        case "FIGHT_PROP_ELEC_ADD_HURT":
-            return StatModifier.DMG_Electro
-        case "FIGHT_PROP_WATER_ADD_HURT":
-            return StatModifier.DMG_Hydro
-        case "FIGHT_PROP_WIND_ADD_HURT":
-            return StatModifier.DMG_Anemo
-        case "FIGHT_PROP_ICE_ADD_HURT":
-            return StatModifier.DMG_Cryo
-        case "FIGHT_PROP_ROCK_ADD_HURT":
-            return StatModifier.DMG_Geo
-        case "FIGHT_PROP_GRASS_ADD_HURT":
-            return StatModifier.DMG_Dendro
-        case _:
-            raise ValueError(f"Invalid property ID {prop_id}.")
+    return StatModifier.from_prop_id(prop_id)
+
+
+# Mapping between property IDs and artifact stats, along with the divisor
+# to apply to their raw value (percentages are given out of 100)
+_PROP_ID_TO_STAT_AND_DIVISOR: dict[str, tuple[StatModifier, float]] = {
+    prop_id: (stat_modifier, 100.0 if stat_modifier in PERCENT_STAT_MODIFIERS else 1.0)
+    for prop_id, stat_modifier in PROP_ID_TO_STAT_MODIFIER.items()
+}
+
+
+def prop_id_to_artifact_stat_and_divisor(prop_id: str) -> tuple[StatModifier, float]:
+    """
+    Convert a property ID to an artifact stat, along with the divisor to
+    apply to its raw value.
+    """
+    try:
+        return _PROP_ID_TO_STAT_AND_DIVISOR[prop_id]
+    except KeyError:
+        if prop_id in INVALID_PROP_IDS:
+            raise ValueError(f"Main stat {prop_id} is not valid for an artifact.") from None
+        raise ValueError(f"Invalid property ID {prop_id}.") from None
 
 
 def get_artifact_rolls(
@@ -74,20 +61,28 @@ def get_artifact_rolls(
     rolls: list[tuple[StatModifier, float]] = []
 
     # Get all the roll IDs of the artifact
-    roll_ids: list[int] = nested_get(artifact_dict, "reliquary", "appendPropIdList")
+    roll_ids: list[int] = artifact_dict["reliquary"].get("appendPropIdList", [])
 
     # For each ID, get the corresponding stat and value
     for roll_id in roll_ids:
-        for element in RELIQUARIAFFIXEXCELCONFIGDATA:
-            if element["id"] == roll_id:
-                roll_type: StatModifier = prop_id_to_artifact_stat(element["propType"])
-                roll_value: float = element["propValue"]
-                rolls.append((roll_type, roll_value))
+        if roll_id in RELIQUARYAFFIX_BY_ID:
+            rolls.append(RELIQUARYAFFIX_BY_ID[roll_id])
 
     # Return the list of rolls
     return rolls
 
 
+def get_artifact_rolls_batch(
+    artifact_dicts: list[ArtifactDict],
+) -> list[list[tuple[StatModifier, float]]]:
+    """
+    Get the rolls of several artifacts at once. The result holds one list
+    of rolls per artifact, in the same order as the artifacts, as returned
+    by get_artifact_rolls.
+    """
+    return [get_artifact_rolls(artifact_dict) for artifact_dict in artifact_dicts]
+
+
 def get_artifact_main_stat(
     artifact_dict: ArtifactDict,
 ) -> tuple[StatModifier, float]:
@@ -96,18 +91,15 @@ def get_artifact_main_stat(
     the type of the main stat and its value.
     """
     # Get the main stat raw data
-    main_stat_id: str = nested_get(artifact_dict, "flat", "reliquaryMainstat", "mainPropId")
-    main_stat_value: float = nested_get(artifact_dict, "flat", "reliquaryMainstat", "statValue")
-
-    # Find the corresponding main stat type
-    main_stat_type: StatModifier = prop_id_to_artifact_stat(main_stat_id)
+    main_stat_id: str = artifact_dict["flat"]["reliquaryMainstat"]["mainPropId"]
+    main_stat_value: float = artifact_dict["flat"]["reliquaryMainstat"]["statValue"]
 
-    # Adjust the value if it is a percentage
-    if main_stat_type in PERCENT_STAT_MODIFIERS:
-        main_stat_value /= 100
+    # Find the corresponding main stat type, and adjust the value if it is
+    # a percentage
+    main_stat_type, divisor = prop_id_to_artifact_stat_and_divisor(main_stat_id)
 
     # Return the main stat type and its value
-    return main_stat_type, main_stat_value
+    return main_stat_type, main_stat_value / divisor
 
 
 def get_artifact_substats(
@@ -119,100 +111,100 @@ def get_artifact_substats(
     element is its value.
     """
     # Get all the substats of the artifact
-    substat_dicts: list[SubstatDict] = nested_get(artifact_dict, "flat", "reliquarySubstats")
+    substat_dicts: list[SubstatDict] = artifact_dict["flat"].get("reliquarySubstats", [])
 
     # Initialize the list of substats
     substats: list[tuple[StatModifier, float]] = []
     for substat_dict in substat_dicts:
 
         # Find the raw data of the substat
-        substat_id = nested_get(substat_dict, "appendPropId")
-        substat_value: float = nested_get(substat_dict, "statValue")
-
-        # Find the corresponding substat type
-        substat_type: StatModifier = prop_id_to_artifact_stat(substat_id)
+        substat_id = substat_dict["appendPropId"]
+        substat_value: float = substat_dict["statValue"]
 
-        # Adjust the value if it is a percentage
-        if substat_type in PERCENT_STAT_MODIFIERS:
-            substat_value /= 100
+        # Find the corresponding substat type, and adjust the value if it
+        # is a percentage
+        substat_type, divisor = prop_id_to_artifact_stat_and_divisor(substat_id)
 
         # Append the substat to the list
-        substats.append((substat_type, substat_value))
+        substats.append((substat_type, substat_value / divisor))
 
     # Return the list of substats
     return substats
 
 
-def get_character_name(character_dict: CharacterDict) -> str:
+@functools.cache
+def _character_name_from_id(character_id: int) -> str:
     """
-    Get the name of a character from its dictionary.
+    Get the name of a character from its ID. As the name of a character
+    never changes, the result is cached.
     """
-    # Get the character ID
-    character_id: int = nested_get(character_dict, "avatarId")
-
     # Get the character name hash from its ID
     character_name_hash: int = nested_get(
-        CHARACTERS,
-        str(character_id),
+        CHARACTERS_BY_ID,
+        character_id,
         "NameTextMapHash"
     )
 
     # Get a human-readable name from the hash, in the desired language
-    character_name: str = nested_get(
-        LOC,
-        LANG,
-        str(character_name_hash),
-    )
+    character_name: str = LOC_BY_HASH.get(character_name_hash)
 
     # Return the character name
     return character_name
 
 
+def get_character_name(character_dict: CharacterDict) -> str:
+    """
+    Get the name of a character from its dictionary.
+    """
+    return _character_name_from_id(character_dict["avatarId"])
+
+
 def get_artifact_level(artifact_dict: ArtifactDict) -> int:
     """
     Get the level of an artifact.
     """
-    return nested_get(artifact_dict, "reliquary", "level")
+    return artifact_dict["reliquary"]["level"]
 
 
 def get_player_nickname(player_dict: PlayerDict) -> str:
     """
     Get the nickname of a player.
     """
-    return nested_get(player_dict, "playerInfo", "nickname")
+    return player_dict["playerInfo"].get("nickname")
+
+
+# Keys of each stat in the 'fightPropMap' of a character. Stats made of a
+# base, a flat bonus and a percent bonus are given as a (base, flat,
+# percent) tuple of keys.
+_STAT_KEYS: dict[Stat, tuple[str, str, str] | str] = {
+    Stat.HP: ("1", "2", "3"),
+    Stat.ATK: ("4", "5", "6"),
+    Stat.DEF: ("7", "8", "9"),
+    Stat.CR: "20",
+    Stat.CD: "22",
+    Stat.ER: "23",
+    Stat.EM: "28",
+}
 
 
 def get_character_stat(
     character_dict: CharacterDict,
     stat: Stat,
 ) -> float:
+    # Get the keys of the wanted stat
+    if stat not in _STAT_KEYS:
+        raise ValueError(f"Invalid stat {stat}.")
+    keys: tuple[str, str, str] | str = _STAT_KEYS[stat]
+
     # Compute the wanted stat
-    match stat:
-        case Stat.HP:
-            hp_base: float = nested_get(character_dict, "fightPropMap").get("1", 0)
-            hp_flat: float = nested_get(character_dict, "fightPropMap").get("2", 0)
-            hp_percent: float = nested_get(character_dict, "fightPropMap").get("3", 0)
-            return hp_base * (1 + hp_percent) + hp_flat
-        case Stat.ATK:
-            atk_base: float = nested_get(character_dict, "fightPropMap").get("4", 0)
-            atk_flat: float = nested_get(character_dict, "fightPropMap").get("5", 0)
-            atk_percent: float = nested_get(character_dict, "fightPropMap").get("6", 0)
-            return atk_base * (1 + atk_percent) + atk_flat
-        case Stat.DEF:
-            def_base: float = nested_get(character_dict, "fightPropMap").get("7", 0)
-            def_flat: float = nested_get(character_dict, "fightPropMap").get("8", 0)
-            def_percent: float = nested_get(character_dict, "fightPropMap").get("9", 0)
-            return def_base * (1 + def_percent) + def_flat
-        case Stat.CR:
-            return nested_get(character_dict, "fightPropMap").get("20", 0)
-        case Stat.CD:
-            return nested_get(character_dict, "fightPropMap").get("22", 0)
-        case Stat.ER:
-            return nested_get(character_dict, "fightPropMap").get("23", 0)
-        case Stat.EM:
-            return nested_get(character_dict, "fightPropMap").get("28", 0)
-        case _:
-            raise ValueError(f"Invalid stat {stat}.")
+    fight_prop_map: dict[str, float] = character_dict["fightPropMap"]
+    if isinstance(keys, tuple):
+        base_key, flat_key, percent_key = keys
+        base: float = fight_prop_map.get(base_key, 0)
+        flat: float = fight_prop_map.get(flat_key, 0)
+        percent: float = fight_prop_map.get(percent_key, 0)
+        return base * (1 + percent) + flat
+    return fight_prop_map.get(keys, 0)
 
 
 def get_character_weapon(
@@ -222,12 +214,12 @@ def get_character_weapon(
     Get the weapon of a character.
     """
     # Get all the equipped dicts
-    equip_dicts: list[EquipmentDict] = nested_get(character_dict, "equipList")
+    equip_dicts: list[EquipmentDict] = character_dict["equipList"]
 
     # Keep only weapon, characterized by having a 'weapon' key
     weapon_dict: list[WeaponDict] = [
         equip_dict for equip_dict in equip_dicts
-        if nested_get(equip_dict, "weapon") is not None
+        if equip_dict.get("weapon") is not None
     ]
 
     # Check that there is exactly one weapon, and return it
@@ -238,22 +230,10 @@ def get_character_weapon(
 
 def get_artifact_type(artifact_dict: ArtifactDict) -> ArtifactType:
     # Get the equip type
-    equip_type: str = nested_get(artifact_dict, "flat", "equipType")
+    equip_type: str = artifact_dict["flat"]["equipType"]
 
     # Find the corresponding artifact type
-    match equip_type:
-        case "EQUIP_BRACER":
-            return ArtifactType.FLOWER
-        case "EQUIP_NECKLACE":
-            return ArtifactType.PLUME
-        case "EQUIP_SHOES":
-            return ArtifactType.SANDS
-        case "EQUIP_RING":
-            return ArtifactType.GOBLET
-        case "EQUIP_DRESS":
-            return ArtifactType.CIRCLET
-        case _:
-            raise ValueError(f"Invalid equip type {equip_type}.")
+    return ArtifactType.from_equip_type(equip_type)
 
 
 def get_character_artifact(
@@ -265,25 +245,93 @@ def get_character_artifact(
     the specified type is found, None is returned.
     """
     # Get all the equipped dicts
-    equip_dicts: list[EquipmentDict] = nested_get(character_dict, "equipList")
+    equip_dicts: list[EquipmentDict] = character_dict["equipList"]
 
-    # Keep only artifacts, characterized by having a 'reliquary' key
-    artifact_dicts: list[ArtifactDict] = [
-        equip_dict for equip_dict in equip_dicts
-        if nested_get(equip_dict, "reliquary") is not None
-    ]
+    # Return the first artifact, characterized by having a 'reliquary' key,
+    # of the wanted type
+    for equip_dict in equip_dicts:
+        if equip_dict.get("reliquary") is not None and get_artifact_type(equip_dict) == artifact_type:
+            return equip_dict
+    return None
 
-    # Determine the type of each artifact
-    artifact_types: list[ArtifactType] = [
-        get_artifact_type(artifact_dict=artifact_dict)
-        for artifact_dict in artifact_dicts
-    ]
 
-    # Return the artifact dict corresponding to the wanted type
-    if artifact_type not in artifact_types:
-        return None
-    type_index: int = artifact_types.index(artifact_type)
-    return artifact_dicts[type_index]
+def partition_equipment(
+    character_dict: CharacterDict,
+) -> tuple[WeaponDict, dict[ArtifactType, ArtifactDict]]:
+    """
+    Split the equipment of a character into its weapon and its artifacts,
+    walking the equipment list only once. Artifacts are indexed by type,
+    and types without an equipped artifact are absent from the dict.
+    """
+    # Get all the equipped dicts
+    equip_dicts: list[EquipmentDict] = character_dict["equipList"]
+
+    # Sort each equipment as either a weapon or an artifact. If several
+    # artifacts share a type, the first one is kept.
+    weapon_dicts: list[WeaponDict] = []
+    artifact_dicts: dict[ArtifactType, ArtifactDict] = {}
+    for equip_dict in equip_dicts:
+        if equip_dict.get("reliquary") is not None:
+            artifact_dicts.setdefault(get_artifact_type(artifact_dict=equip_dict), equip_dict)
+        elif equip_dict.get("weapon") is not None:
+            weapon_dicts.append(equip_dict)
+
+    # Check that there is exactly one weapon, and return the equipment
+    if len(weapon_dicts) != 1:
+        raise ValueError(f"Expected one weapon, got {len(weapon_dicts)}.")
+    return weapon_dicts[0], artifact_dicts
+
+
+# In-memory cache of the player dicts, indexed by (uid, summary_only). Each
+# entry holds the date at which the data was fetched, along with the data.
+_PLAYER_DICTS_CACHE: dict[tuple[int, bool], tuple[dt.datetime, PlayerDict]] = {}
+
+# Lock guarding the updates of the in-memory cache, as players may be fetched
+# from several threads at once
+_PLAYER_DICTS_CACHE_LOCK: threading.Lock = threading.Lock()
+
+
+def _cache_player_dict(
+    cache_key: tuple[int, bool],
+    fetch_date: dt.datetime,
+    data: PlayerDict,
+) -> None:
+    """
+    Store a player dict in the in-memory cache. Expired entries are removed
+    first, and if the cache is still full, the oldest entries are evicted.
+    """
+    with _PLAYER_DICTS_CACHE_LOCK:
+
+        # Remove expired entries, as well as the previous entry for this key
+        now: dt.datetime = dt.datetime.now()
+        for key, (date, _) in list(_PLAYER_DICTS_CACHE.items()):
+            if key == cache_key or now - date >= PLAYER_CACHE_EXPIRATION:
+                _PLAYER_DICTS_CACHE.pop(key, None)
+
+        # Evict the oldest entries until there is room for the new one.
+        # Entries are kept in insertion order, so the oldest one comes first.
+        while len(_PLAYER_DICTS_CACHE) >= PLAYER_MEMORY_CACHE_MAXSIZE:
+            _PLAYER_DICTS_CACHE.pop(next(iter(_PLAYER_DICTS_CACHE)), None)
+
+        # Store the new entry
+        _PLAYER_DICTS_CACHE[cache_key] = (fetch_date, data)
+
+
+def invalidate_player_dict(uid: int | None = None) -> None:
+    """
+    Remove a player from the in-memory cache used by get_player_dict. If no
+    UID is provided, the whole in-memory cache is cleared. The file cache is
+    left untouched.
+
+    Args:
+        uid (int, optional): the UID of the player. Defaults to None.
+    """
+    with _PLAYER_DICTS_CACHE_LOCK:
+        if uid is None:
+            _PLAYER_DICTS_CACHE.clear()
+            return
+        for summary_only in (False, True):
+            _PLAYER_DICTS_CACHE.pop((uid, summary_only), None)
 
 
 def get_player_dict(
@@ -298,6 +346,10 @@ def get_player_dict(
             uid (int): the UID of the player.
             summary_only (bool): if True, only the summary is returned.
             allow_file_cache (bool): if True, the data is saved to a file.
+                The data is also kept in memory, so that subsequent calls
+                within the same process do not read the file again. In
+                that case, subsequent calls return the very same dict, which
+                must thus not be modified by the caller.
 
         Returns:
             data (PlayerDict): the data of the player.
@@ -307,37 +359,57 @@ def get_player_dict(
             Exception: if the request failed for an unexpected reason (which
                 is not related to the Enka.Network API).
         """
+        # Define the type for future variables
+        data: PlayerDict
+
+        # If 'allow_file_cache' is True, check if the data is already in memory
+        cache_key: tuple[int, bool] = (uid, summary_only)
+        cache_entry: tuple[dt.datetime, PlayerDict] | None = _PLAYER_DICTS_CACHE.get(cache_key)
+        if allow_file_cache and cache_entry is not None:
+            fetch_date, cached_data = cache_entry
+            if dt.datetime.now() - fetch_date < PLAYER_CACHE_EXPIRATION:
+                logging.debug(f"Using in-memory cache for player {uid}.")
+                return cached_data
+
         # If 'allow_file_cache' is True, check if the file exists
         file_path: str = os.path.join(PLAYERS_CACHE_FOLDER, f"{uid}.json")
 
+        # Get the status of the file, if it exists
+        file_stat: os.stat_result | None = None
+        if allow_file_cache:
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                pass
+
         # Check if the file exists, and load it if it does
-        if allow_file_cache and os.path.exists(file_path):
+        if file_stat is not None:
 
             # Get the last modification date of the file
-            timestamp: float = os.path.getmtime(file_path)
-            last_modification: dt.datetime = dt.datetime.fromtimestamp(timestamp)
+            last_modification: dt.datetime = dt.datetime.fromtimestamp(file_stat.st_mtime)
 
             # Retrieve file from cache only if it is less than 1 day old
             if dt.datetime.now() - last_modification < PLAYER_CACHE_EXPIRATION:
                 logging.debug(f"Using cache for player {uid}.")
                 try:
-                    with open(file_path, "r") as file:
-                        return json.load(file)
-                except json.JSONDecodeError:
+                    with open(file_path, "rb") as file:
+                        data = orjson.loads(file.read())
+                    _cache_player_dict(cache_key, last_modification, data)
+                    return data
+                except orjson.JSONDecodeError:
                     logging.error(f"Could not read cache for player {uid}. Fetching new data.")
             else:
                 logging.debug(f"Cache for player {uid} is outdated. Fetching new data.")
 
         # Define the type for future variables
         response: requests.Response
-        data: PlayerDict
 
         # If summary_only is False, return the full data. Otherwise, only
         # return a summary
         if not summary_only:
-            response = requests.get(f"{BASE_URL}/{uid}")
+            response = _SESSION.get(f"{BASE_URL}/{uid}")
         else:
-            response = requests.get(f"{BASE_URL}/{uid}?info")
+            response = _SESSION.get(f"{BASE_URL}/{uid}?info")
 
         # Check the status code of the response
         if response.status_code in RESPONSE_CODES:
@@ -345,13 +417,19 @@ def get_player_dict(
         elif response.status_code != 200:
             raise Exception(f"Unexpected status code {response.status_code}.")
         else:
-            data = response.json()
+            data = orjson.loads(response.content)
 
-        # If 'allow_file_cache' is True, save the data to the file
+        # If 'allow_file_cache' is True, save the data to the file. The raw
+        # response is already valid JSON, so it is written as is.
+        # The file cache is best-effort, so failing to write it (e.g. while
+        # another process has the file open on Windows) is not an error.
         if allow_file_cache:
-            os.makedirs(PLAYERS_CACHE_FOLDER, exist_ok=True)
-            with open(file_path, "w") as file:
-                json.dump(data, file)
+            try:
+                os.makedirs(PLAYERS_CACHE_FOLDER, exist_ok=True)
+                atomic_write(file_path, response.content)
+            except OSError as e:
+                logging.error(f"Could not write cache for player {uid}: {e}")
+            _cache_player_dict(cache_key, dt.datetime.now(), data)
 
         # Return the data
         return data
@@ -1,9 +1,10 @@
 import os
 import requests
-import json
-from typing import Any, cast
+import orjson
+from typing import Any
 import datetime as dt
 import logging
+import threading
 
 
 AnyNumber = int | float
@@ -27,7 +28,7 @@ def nested_get(
     Returns:
         Any: The value found in the dictionary.
     """
-    current: dict | Any = data.copy()
+    current: dict | Any = data
     for key in keys:
         if key not in current:
             return default
@@ -35,6 +36,28 @@ def nested_get(
     return current
 
 
+def atomic_write(file_path: str, content: bytes) -> None:
+    """
+    Write bytes to a file atomically. The content is first written to a
+    temporary file next to the target, which then replaces the target. This
+    way, a crash or a concurrent write never leaves a truncated file. Note
+    that on Windows, replacing the target fails with an OSError while
+    another process has it open.
+
+    Args:
+        file_path (str): The path of the file to write.
+        content (bytes): The content to write.
+    """
+    tmp_file_path: str = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_file_path, file_path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+
 def smart_json_load(
     url: str,
     folder: str | None = None,
@@ -60,40 +83,71 @@ def smart_json_load(
     # its content.
     file_name: str
     file_path: str
+    etag_file_path: str
+    headers: dict[str, str] = {}
     if folder is not None:
 
         # Check if file exists
         file_name = os.path.basename(url)
         file_path = os.path.join(folder, file_name)
-        if os.path.isfile(file_path):
+        etag_file_path = f"{file_path}.etag"
+        try:
+            file_stat: os.stat_result | None = os.stat(file_path)
+        except FileNotFoundError:
+            file_stat = None
+        if file_stat is not None:
 
             # Get the last modification date of the file
-            timestamp: float = os.path.getmtime(file_path)
-            last_modification: dt.datetime = dt.datetime.fromtimestamp(timestamp)
+            last_modification: dt.datetime = dt.datetime.fromtimestamp(file_stat.st_mtime)
 
             # Load data only if the file is not expired. If no expiration is
             # provided, the file does never expire (i.e. it is only loaded
             # once).
             if expiration is None or dt.datetime.now() - last_modification < expiration:
                 logging.debug(f"Loading {file_name} from cache")
-                with open(file_path, "r") as f:
-                    return json.load(f)
+                with open(file_path, "rb") as f:
+                    return orjson.loads(f.read())
             else:
                 logging.debug(f"{file_name} is expired. Fetching from URL")
 
+                # If the ETag of the cached file is known, only ask for the
+                # file if it changed since then
+                try:
+                    with open(etag_file_path, "r") as f:
+                        headers["If-None-Match"] = f.read()
+                except FileNotFoundError:
+                    pass
+
     # If no cache folder is provided or if the file does not exist, load the
     # file from the URL
-    response = requests.get(url)
+    response = requests.get(url, headers=headers)
+
+    # If the file did not change, renew the cached file and return its content
+    if response.status_code == 304:
+        logging.debug(f"{file_name} did not change. Loading from cache")
+        os.utime(file_path)
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    # Otherwise, decode the fetched file
     response.raise_for_status()
-    data = json.loads(response.text)
+    data = orjson.loads(response.content)
 
     # If cache folder provided (and thus we are allowed to use file caching),
-    # save the file in the cache folder
-    folder = cast(str , folder)
-    os.makedirs(folder, exist_ok=True)
+    # save the file in the cache folder, along with its ETag if any. The old
+    # ETag is removed first, so that it never outlives the file it describes.
+    # The cache is best-effort, so failing to write it is not an error.
     if folder is not None:
-        with open(file_path, "w") as f:
-            json.dump(data, f)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            if os.path.exists(etag_file_path):
+                os.remove(etag_file_path)
+            atomic_write(file_path, response.content)
+            etag: str | None = response.headers.get("ETag")
+            if etag is not None:
+                atomic_write(etag_file_path, etag.encode())
+        except OSError as e:
+            logging.error(f"Could not write {file_name} to cache: {e}")
 
     # Finally return the data
     return data
@@ -0,0 +1,33 @@
+from src.types import StatModifier, ArtifactDict
+from src.utils.enka import get_artifact_rolls, get_artifact_rolls_batch
+
+
+def make_artifact_dict(roll_ids: list[int]) -> ArtifactDict:
+    return {"reliquary": {"level": 21, "appendPropIdList": roll_ids}}
+
+
+def test_get_artifact_rolls_keeps_every_roll() -> None:
+    artifact_dict: ArtifactDict = make_artifact_dict([501204, 501234, 501234, 501021])
+    assert get_artifact_rolls(artifact_dict) == [
+        (StatModifier.CR, 0.0389),
+        (StatModifier.CD, 0.0777),
+        (StatModifier.CD, 0.0777),
+        (StatModifier.HP_FLAT, 209.13),
+    ]
+
+
+def test_get_artifact_rolls_skips_unknown_rolls() -> None:
+    # 509999 has an unknown type, and 123 is not a roll ID at all
+    assert get_artifact_rolls(make_artifact_dict([509999, 123, 501204])) == [(StatModifier.CR, 0.0389)]
+    assert get_artifact_rolls({"reliquary": {"level": 1}}) == []
+
+
+def test_get_artifact_rolls_batch_keeps_artifacts_apart() -> None:
+    artifact_dicts: list[ArtifactDict] = [
+        make_artifact_dict([509999, 501204]),
+        make_artifact_dict([501204]),
+    ]
+    assert get_artifact_rolls_batch(artifact_dicts) == [
+        [(StatModifier.CR, 0.0389)],
+        [(StatModifier.CR, 0.0389)],
+    ]